@@ -1,4 +1,12 @@
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pulp
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
 
 class PlanoDeCorte:
     """
@@ -16,97 +24,243 @@ class PlanoDeCorte:
             b (list): Vector de términos independientes de las restricciones.
         """
         self.c = c
-        self.A = A
-        self.b = b
         self.num_vars = len(c)
         self.num_restricciones = len(A)
+        # A se guarda en formato CSR: las restricciones se construyen solo con sus coeficientes no nulos.
+        self.A = sparse.csr_matrix(np.asarray(A, dtype=float).reshape(self.num_restricciones, self.num_vars))
+        self.b = list(b)
+        # Búferes reutilizados en cada iteración por distancia_entero
+        self._valores = np.empty(self.num_vars)
+        self._parte_entera = np.empty(self.num_vars)
+        self._parte_fraccionaria = np.empty(self.num_vars)
+        self._distancias = np.empty(self.num_vars)
+
+    def distancia_entero(self, valores):
+        """
+        Calcula, en una sola pasada vectorizada, la distancia de cada valor al entero más cercano.
+
+        Los cálculos se hacen sobre búferes preasignados, por lo que el arreglo devuelto se
+        sobrescribe en la siguiente llamada.
+        """
+        self._valores[:] = valores
+        np.floor(self._valores, out=self._parte_entera)
+        np.subtract(self._valores, self._parte_entera, out=self._parte_fraccionaria)
+        np.subtract(1, self._parte_fraccionaria, out=self._distancias)
+        return np.minimum(self._parte_fraccionaria, self._distancias, out=self._distancias)
 
     def es_entero(self, valores):
-        return all(abs(x - round(x)) < 1e-5 for x in valores)
+        return self.son_enteras(self.distancia_entero(valores))
 
-    def resolver(self):
-        iteracion = 0
-        cortes = []
+    def son_enteras(self, distancias):
+        """
+        Indica si todas las distancias devueltas por distancia_entero están dentro de la tolerancia.
+        """
+        return not np.any(distancias >= 1e-5)
 
-        while True:
-            iteracion += 1
-            print(f"\n--- Iteración {iteracion} ---")
+    def construir_modelo(self):
+        """
+        Construye la relajación lineal con la función objetivo y las restricciones originales.
+
+        Las expresiones se crean directamente a partir de pares (variable, coeficiente), evitando
+        los productos y sumas intermedias de pulp.lpDot/pulp.lpSum.
 
-            # Crear modelo PuLP
-            prob = pulp.LpProblem("PL_enteros", pulp.LpMaximize)
-            x = [pulp.LpVariable(f"x{i}", lowBound=0, cat='Continuous') for i in range(self.num_vars)]
+        Returns:
+            tuple: El problema PuLP y la lista de variables de decisión.
+        """
+        prob = pulp.LpProblem("PL_enteros", pulp.LpMaximize)
+        x = [pulp.LpVariable(f"x{i}", lowBound=0, cat='Continuous') for i in range(self.num_vars)]
+
+        # Objetivo
+        prob.setObjective(pulp.LpAffineExpression(zip(x, self.c)))
 
-            # Objetivo
-            prob += pulp.lpDot(self.c, x)
+        # Restricciones originales
+        for i in range(self.num_restricciones):
+            inicio, fin = self.A.indptr[i], self.A.indptr[i + 1]
+            expresion = pulp.LpAffineExpression(
+                (x[j], float(a)) for j, a in zip(self.A.indices[inicio:fin], self.A.data[inicio:fin])
+            )
+            prob.addConstraint(pulp.LpConstraint(expresion, pulp.LpConstraintLE, rhs=self.b[i]))
 
-            # Restricciones originales + cortes acumulados
-            for i in range(self.num_restricciones):
-                prob += (pulp.lpDot(self.A[i], x) <= self.b[i])
+        return prob, x
 
-            for corte, rhs in cortes:
-                prob += (pulp.lpDot(corte, x) <= rhs)
+    def elegir_corte(self, prob, x, distancias, num_candidatos, solver):
+        """
+        Evalúa en paralelo los cortes de las variables más fraccionarias y elige el que más
+        reduce el valor objetivo de la relajación lineal.
+
+        Cada candidato se resuelve sobre una copia independiente del modelo. CBC se ejecuta
+        como proceso externo, por lo que basta con hilos para resolver las copias a la vez.
+
+        Args:
+            prob (pulp.LpProblem): Relajación lineal actual.
+            x (list): Variables de decisión de prob.
+            distancias (numpy.ndarray): Distancia de cada variable al entero más cercano.
+            num_candidatos (int): Número máximo de cortes a evaluar.
+            solver (pulp.LpSolver): Solver configurado en resolver. Se comparte entre los hilos,
+                ya que cada llamada de CBC usa sus propios archivos temporales.
 
-            # Resolver relajación lineal
-            prob.solve()
-            status = pulp.LpStatus[prob.status]
-            if status != 'Optimal':
-                print("No es posible resolver el PL en esta iteración.")
+        Returns:
+            tuple: Índice de la variable cuyo corte se debe aplicar y, si ese corte ya se evaluó,
+                la solución y el valor objetivo del PL resultante (None en caso contrario).
+        """
+        # Variables fraccionarias ordenadas de más a menos fraccionaria, descartando los cortes
+        # que no ajustarían la cota actual.
+        fraccionarias = np.flatnonzero(distancias >= 1e-5)
+        orden = fraccionarias[np.argsort(-distancias[fraccionarias], kind='stable')]
+        candidatos = [
+            int(j) for j in orden
+            if x[j].upBound is None or x[j].upBound > self._parte_entera[j]
+        ][:num_candidatos]
+        if len(candidatos) < 2:
+            return (candidatos[0] if candidatos else int(np.argmax(distancias))), None
+
+        modelo = prob.to_dict()
+
+        def evaluar(j):
+            variables, copia = pulp.LpProblem.from_dict(modelo)
+            variables[x[j].name].upBound = int(self._parte_entera[j])
+            copia.solve(solver)
+            if pulp.LpStatus[copia.status] != 'Optimal':
                 return None
+            return [variables[v.name].varValue for v in x], pulp.value(copia.objective)
+
+        with ThreadPoolExecutor(max_workers=len(candidatos)) as executor:
+            resultados = list(executor.map(evaluar, candidatos))
+
+        evaluados = [(j, r) for j, r in zip(candidatos, resultados) if r is not None]
+        if not evaluados:
+            return candidatos[0], None
+        # En caso de empate se mantiene el candidato más fraccionario.
+        return min(evaluados, key=lambda par: par[1][1])
+
+    def resolver(self, num_candidatos=1):
+        """
+        Aplica cortes hasta encontrar una solución entera de la relajación lineal.
+
+        Args:
+            num_candidatos (int): Número de variables fraccionarias cuyos cortes se evalúan en
+                paralelo en cada iteración. Con 1 se corta siempre la variable más fraccionaria.
+
+        Returns:
+            tuple or None: La solución y su valor objetivo, o None si el PL no tiene solución óptima.
+        """
+        iteracion = 0
+
+        # El modelo se construye una sola vez; los cortes se aplican sobre él
+        # en lugar de reconstruirlo en cada iteración.
+        prob, x = self.construir_modelo()
+
+        # CBC se ejecuta a través de PuLP como un proceso nuevo que lee el modelo de cero en cada
+        # llamada, así que no puede reanudar el PL desde la base anterior.
+        # Se desactiva el presolve y, con mip=False, PuLP lanza -initialSolve, que resuelve la
+        # relajación continua una sola vez con el simplex dual de CBC (añadir la opción
+        # dualSimplex haría que el PL se resolviera dos veces por llamada). La salida de CBC
+        # solo se muestra con el nivel de registro DEBUG.
+        solver = pulp.PULP_CBC_CMD(msg=logger.isEnabledFor(logging.DEBUG), mip=False, presolve=False)
+
+        # Solución del PL con el último corte, si elegir_corte ya la calculó
+        resultado_corte = None
+
+        while True:
+            iteracion += 1
+            logger.info("\n--- Iteración %d ---", iteracion)
+
+            if resultado_corte is not None:
+                # El PL con este corte ya se resolvió al evaluar los candidatos
+                solucion, resultado_objetivo = resultado_corte
+                resultado_corte = None
+            else:
+                # Resolver relajación lineal
+                prob.solve(solver)
+                status = pulp.LpStatus[prob.status]
+                if status != 'Optimal':
+                    logger.warning("No es posible resolver el PL en esta iteración.")
+                    return None
 
-            solucion = [v.varValue for v in x]
-            resultado_objetivo = pulp.value(prob.objective)
-            print(f"Solución actual: {solucion}")
-            print(f"Valor objetivo actual: {resultado_objetivo}")
+                solucion = [v.varValue for v in x]
+                resultado_objetivo = pulp.value(prob.objective)
+            logger.info("Solución actual: %s", solucion)
+            logger.info("Valor objetivo actual: %s", resultado_objetivo)
 
             # ¿Es entera?
-            if self.es_entero(solucion):
-                print("\n¡Se ha encontrado una solución entera óptima!")
+            distancias = self.distancia_entero(solucion)
+            if self.son_enteras(distancias):
+                logger.info("\n¡Se ha encontrado una solución entera óptima!")
                 return solucion, resultado_objetivo
 
             # Buscar la variable más fraccionaria
-            idx_maxfrac = max(
-                range(len(solucion)),
-                key=lambda i: abs(solucion[i] - round(solucion[i]))
-            )
-            frac = solucion[idx_maxfrac] - int(solucion[idx_maxfrac])
+            idx_maxfrac = int(np.argmax(distancias))
+            # Parte fraccionaria y parte entera ya calculadas por distancia_entero
+            frac = self._parte_fraccionaria[idx_maxfrac]
             if frac < 1e-5:
-                print("\nNo se puede avanzar con más cortes. La solución es óptima (aunque podría tener variables casi enteras).")
+                logger.info("\nNo se puede avanzar con más cortes. La solución es óptima (aunque podría tener variables casi enteras).")
                 return solucion, resultado_objetivo
 
-            # Crear corte de Gomory básico (simulado)
-            corte = [0.0] * self.num_vars
-            corte[idx_maxfrac] = 1.0
-            rhs = int(solucion[idx_maxfrac])
-            cortes.append((corte, rhs))
-            print(f"Añadiendo corte: x{idx_maxfrac+1} <= {rhs}")
+            if num_candidatos > 1:
+                idx_maxfrac, resultado_corte = self.elegir_corte(prob, x, distancias, num_candidatos, solver)
+
+            # Crear corte de Gomory básico (simulado). Al afectar a una sola variable se aplica
+            # como cota superior de x[idx] en lugar de añadir una nueva fila al modelo.
+            rhs = int(self._parte_entera[idx_maxfrac])
+
+            # Un corte que no ajusta la cota actual ya está en el modelo (p. ej. cuando el solver
+            # devuelve un valor apenas por encima de la cota por tolerancia); repetirlo no cambia el PL.
+            if x[idx_maxfrac].upBound is not None and x[idx_maxfrac].upBound <= rhs:
+                logger.info("\nEl corte x%d <= %d ya está incluido. No se puede avanzar con más cortes.", idx_maxfrac + 1, rhs)
+                return solucion, resultado_objetivo
+
+            x[idx_maxfrac].upBound = rhs
+            logger.info("Añadiendo corte: x%d <= %d", idx_maxfrac + 1, rhs)
+
+def leer_fila(mensaje, n):
+    """
+    Lee una línea completa con n valores numéricos separados por espacios.
+
+    Args:
+        mensaje (str): Texto mostrado al solicitar la línea.
+        n (int): Número de valores esperados.
+
+    Returns:
+        list: Los valores leídos como números reales.
+
+    Raises:
+        ValueError: Si algún valor no es numérico o la línea no tiene n valores.
+    """
+    valores = np.array(input(mensaje).split(), dtype=float)
+    if valores.size != n:
+        raise ValueError(f"Se esperaban {n} valores y se introdujeron {valores.size}.")
+    return valores.tolist()
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Método de planos de corte para Programación Lineal Entera.")
+    parser.add_argument(
+        "--candidatos", type=int, default=1,
+        help="número de cortes candidatos evaluados en paralelo en cada iteración (por defecto 1)",
+    )
+    args = parser.parse_args()
+    if args.candidatos < 1:
+        parser.error("--candidatos debe ser al menos 1")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     print("Resolución de Problemas de Programación Entera con Plano de Corte y PuLP")
     print("--------------------------------------------------------------------------")
     try:
         num_vars = int(input("Introduce el número de variables de decisión: "))
         num_restricciones = int(input("Introduce el número de restricciones: "))
 
-        c = []
-        print("\nIntroduce los coeficientes de la función objetivo (para maximizar):")
-        for i in range(num_vars):
-            c.append(float(input(f"Coeficiente para x{i+1}: ")))
+        print("\nIntroduce los coeficientes de la función objetivo (para maximizar), separados por espacios:")
+        c = leer_fila("c: ", num_vars)
 
         A = []
-        print("\nIntroduce los coeficientes de las restricciones (matriz A):")
+        print("\nIntroduce los coeficientes de las restricciones (matriz A), una fila por restricción:")
         for i in range(num_restricciones):
-            fila = []
-            for j in range(num_vars):
-                fila.append(float(input(f"Coeficiente de x{j+1} en la restricción {i+1}: ")))
-            A.append(fila)
+            A.append(leer_fila(f"Restricción {i+1}: ", num_vars))
 
-        b = []
-        print("\nIntroduce los términos independientes de las restricciones (vector b):")
-        for i in range(num_restricciones):
-            b.append(float(input(f"Término para la restricción {i+1}: ")))
+        print("\nIntroduce los términos independientes de las restricciones (vector b), separados por espacios:")
+        b = leer_fila("b: ", num_restricciones)
 
         problema = PlanoDeCorte(c, A, b)
-        resultado = problema.resolver()
+        resultado = problema.resolver(num_candidatos=args.candidatos)
 
         if resultado is not None:
             solucion_optima, valor_optimo = resultado
@@ -116,7 +270,7 @@ if __name__ == '__main__':
             print(f"Valor Óptimo de la Función Objetivo: {valor_optimo}")
         else:
             print("\nNo se encontró una solución óptima entera.")
-    except ValueError:
-        print("\nError: Por favor, introduce solo valores numéricos.")
+    except ValueError as e:
+        print(f"\nError: Por favor, introduce solo valores numéricos (la cantidad indicada en cada línea). {e}")
     except Exception as e:
         print(f"\nHa ocurrido un error inesperado: {e}")